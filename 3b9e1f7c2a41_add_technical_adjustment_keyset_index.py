@@ -0,0 +1,42 @@
+"""Add keyset pagination covering index on technical_adjustment
+
+Revision ID: 3b9e1f7c2a41
+Revises:
+Create Date: 2026-10-15 15:02:11.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3b9e1f7c2a41"
+# Base of the labelled "technical_adjustment" branch. It only touches indexes and
+# column defaults on tables the main history creates, so on a fresh database the
+# main history must be applied first; the pipeline runs `alembic upgrade heads`.
+down_revision = None
+branch_labels = ("technical_adjustment",)
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # Serves the equality filter and the keyset ORDER BY in one index. Only small
+        # fixed-width columns are INCLUDEd: the free-text and array columns could
+        # push an entry past the ~2.7 kB B-tree limit and fail inserts.
+        op.execute(
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_ta_ii_pto
+            ON technical_adjustment (
+                insurable_interest_set_id,
+                policy_term_option_id,
+                created_at DESC,
+                id DESC
+            )
+            INCLUDE (quote_option_id, adjustment_value, adjustment_model_field_id)
+            """
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_ta_ii_pto")
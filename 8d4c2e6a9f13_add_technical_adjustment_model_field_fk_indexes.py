@@ -0,0 +1,41 @@
+"""Add FK indexes for technical adjustment model field joins
+
+Revision ID: 8d4c2e6a9f13
+Revises: 3b9e1f7c2a41
+Create Date: 2026-10-15 15:31:47.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8d4c2e6a9f13"
+down_revision = "3b9e1f7c2a41"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tamf_technical_adjustment_field_id
+            ON technical_adjustment_model_field (technical_adjustment_field_id)
+            """
+        )
+        op.execute(
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tamf_technical_adjustment_model_configuration_id
+            ON technical_adjustment_model_field (technical_adjustment_model_configuration_id)
+            """
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "DROP INDEX CONCURRENTLY IF EXISTS ix_tamf_technical_adjustment_model_configuration_id"
+        )
+        op.execute(
+            "DROP INDEX CONCURRENTLY IF EXISTS ix_tamf_technical_adjustment_field_id"
+        )
@@ -0,0 +1,46 @@
+"""Default technical_adjustment array columns to empty arrays
+
+Revision ID: c5a7e0b3d218
+Revises: 8d4c2e6a9f13
+Create Date: 2026-10-15 16:04:28.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c5a7e0b3d218"
+down_revision = "8d4c2e6a9f13"
+branch_labels = None
+depends_on = None
+
+# The columns are mapped as ARRAY(String), i.e. varchar[] in Postgres. This only
+# normalises the element type to text[]; it does not convert json/jsonb columns.
+ARRAY_COLUMNS = ("asset_types", "perils", "insured_value_types")
+
+
+def upgrade() -> None:
+    for column in ARRAY_COLUMNS:
+        op.execute(
+            f"UPDATE technical_adjustment SET {column} = '{{}}' WHERE {column} IS NULL"
+        )
+        op.execute(
+            f"""
+            ALTER TABLE technical_adjustment
+                ALTER COLUMN {column} TYPE text[] USING {column}::text[],
+                ALTER COLUMN {column} SET DEFAULT '{{}}',
+                ALTER COLUMN {column} SET NOT NULL
+            """
+        )
+
+
+def downgrade() -> None:
+    for column in ARRAY_COLUMNS:
+        op.execute(
+            f"""
+            ALTER TABLE technical_adjustment
+                ALTER COLUMN {column} DROP NOT NULL,
+                ALTER COLUMN {column} DROP DEFAULT,
+                ALTER COLUMN {column} TYPE varchar[] USING {column}::varchar[]
+            """
+        )
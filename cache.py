@@ -0,0 +1,156 @@
+import logging
+from functools import cache
+from uuid import UUID
+
+from redis import Redis as SyncRedis
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.settings import get_app_settings
+from app.vault import models as M
+from app.vault import types
+
+logger = logging.getLogger(__name__)
+
+TECHNICAL_ADJUSTMENTS_TTL_SECONDS = 300
+# Streamed bodies larger than this are not buffered for caching.
+MAX_CACHED_BODY_BYTES = 1024 * 1024
+PREFETCHED_PAGE_TTL_SECONDS = 30
+
+# Session.info keys used to carry pending invalidations through a commit.
+_STALE_PRICING_INPUT_IDS = "technical_adjustments_stale_pricing_input_ids"
+_STALE_KEY_PATTERNS = "technical_adjustments_stale_key_patterns"
+
+
+@cache
+def get_redis() -> Redis:
+    """Async client used by the read path, built on first use from ``AppSettings``."""
+    return Redis.from_url(get_app_settings().REDIS_URL)
+
+
+@cache
+def get_sync_redis() -> SyncRedis:
+    """Sync client used by the post-commit invalidation hook."""
+    return SyncRedis.from_url(get_app_settings().REDIS_URL)
+
+
+def technical_adjustments_key(
+    insurable_interest_set_id: UUID,
+    policy_term_option_id: UUID,
+    cursor: str | None = None,
+    page_size: int | None = None,
+) -> str:
+    """Cache key for a serialized technical adjustments response."""
+    return (
+        f"ta:{insurable_interest_set_id}:{policy_term_option_id}"
+        f":{cursor or '-'}:{page_size or '-'}"
+    )
+
+
+async def get_cached(key: str) -> bytes | None:
+    """Read a cached body; a Redis failure is logged and treated as a miss."""
+    try:
+        return await get_redis().get(key)
+    except RedisError as e:
+        logger.warning("Cache read failed for %s: %s", key, e)
+        return None
+
+
+async def set_cached(
+    key: str, body: bytes, ttl: int = TECHNICAL_ADJUSTMENTS_TTL_SECONDS
+) -> None:
+    """Store a body; a Redis failure is logged and the response is served uncached."""
+    try:
+        await get_redis().set(key, body, ex=ttl)
+    except RedisError as e:
+        logger.warning("Cache write failed for %s: %s", key, e)
+
+
+async def get_cached_page(key: str) -> tuple[bytes, str | None] | None:
+    """Read a cached page body and its ``next_cursor``; Redis failures are a miss."""
+    try:
+        body, next_cursor = await get_redis().hmget(key, ["body", "next_cursor"])
+    except RedisError as e:
+        logger.warning("Cache read failed for %s: %s", key, e)
+        return None
+    if body is None:
+        return None
+    return body, next_cursor.decode() if next_cursor else None
+
+
+async def set_cached_page(
+    key: str,
+    body: bytes,
+    next_cursor: str | None,
+    ttl: int = TECHNICAL_ADJUSTMENTS_TTL_SECONDS,
+) -> None:
+    """Store a page body with its ``next_cursor`` so hits needn't parse the body."""
+    try:
+        async with get_redis().pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={"body": body, "next_cursor": next_cursor or ""})
+            pipe.expire(key, ttl)
+            await pipe.execute()
+    except RedisError as e:
+        logger.warning("Cache write failed for %s: %s", key, e)
+
+
+def mark_technical_adjustments_stale(
+    session: Session, pricing_input_id: types.PricingInputId
+) -> None:
+    """Queue cache invalidation for technical adjustments written under a pricing input.
+
+    Called by write paths. The affected insurable interest set / policy term option
+    pairs are resolved just before commit and their cached pages dropped once the
+    commit succeeds, so readers never re-cache pre-commit data.
+    """
+    session.info.setdefault(_STALE_PRICING_INPUT_IDS, set()).add(pricing_input_id)
+
+
+@event.listens_for(Session, "before_commit")
+def _resolve_stale_technical_adjustments(session: Session) -> None:
+    pricing_input_ids = session.info.pop(_STALE_PRICING_INPUT_IDS, None)
+    if not pricing_input_ids:
+        return
+
+    statement = (
+        select(
+            M.PricingInput.insurable_interest_set_id,
+            M.PolicyTermOption.policy_term_option_id,
+        )
+        .join(
+            M.PolicyTermOption,
+            M.PricingInput.id == M.PolicyTermOption.pricing_input_id,
+        )
+        .where(M.PricingInput.id.in_(pricing_input_ids))
+    )
+    session.info.setdefault(_STALE_KEY_PATTERNS, set()).update(
+        f"ta:{insurable_interest_set_id}:{policy_term_option_id}:*"
+        for insurable_interest_set_id, policy_term_option_id in session.execute(
+            statement
+        )
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_stale_technical_adjustments(session: Session) -> None:
+    patterns = session.info.pop(_STALE_KEY_PATTERNS, None)
+    if not patterns:
+        return
+
+    client = get_sync_redis()
+    for pattern in patterns:
+        try:
+            keys = list(client.scan_iter(match=pattern))
+            if keys:
+                client.delete(*keys)
+        except RedisError as e:
+            # The commit has already happened; entries expire within the cache TTL.
+            logger.error("Cache invalidation failed for %s: %s", pattern, e)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_stale_technical_adjustments(session: Session) -> None:
+    session.info.pop(_STALE_PRICING_INPUT_IDS, None)
+    session.info.pop(_STALE_KEY_PATTERNS, None)
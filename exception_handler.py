@@ -1,6 +1,10 @@
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.exc import SQLAlchemyError
 
-def sqlalchemy_error_handler(request: Request, exc: SQLAlchemyError) -> JSONResponse:
+_UTC = timezone.utc
+
+
+def sqlalchemy_error_handler(request: Request, exc: SQLAlchemyError) -> ORJSONResponse:
     """Catch-all handler for unexpected SQLAlchemy exceptions."""
     logger.error(
         "Unhandled SQLAlchemy error",
@@ -10,7 +14,7 @@ def sqlalchemy_error_handler(request: Request, exc: SQLAlchemyError) -> JSONResp
 
     http_status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
     body = ErrorResponse(
-        timestamp=datetime.now(timezone.utc),
+        timestamp=datetime.now(_UTC),
         status=http_status_code,
         title="Database Error",
         errors=[
@@ -19,6 +23,6 @@ def sqlalchemy_error_handler(request: Request, exc: SQLAlchemyError) -> JSONResp
             )
         ],
         path=request.url.path,
-    ).model_dump()
+    ).model_dump(mode="json")
 
-    return JSONResponse(jsonable_encoder(body), status_code=http_status_code)
\ No newline at end of file
+    return ORJSONResponse(body, status_code=http_status_code)
\ No newline at end of file
@@ -1,123 +1,270 @@
-from fastapi import APIRouter, Depends, Query, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
+import base64
+import json
+from collections.abc import AsyncIterator, Callable, Iterator
+from datetime import datetime
 from uuid import UUID
-from app.db.session import get_db
+
+import orjson
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from sqlalchemy import Row, lambda_stmt, select, tuple_
+from sqlalchemy.orm import joinedload
+
+from app.cache import (
+    MAX_CACHED_BODY_BYTES,
+    PREFETCHED_PAGE_TTL_SECONDS,
+    get_cached,
+    get_cached_page,
+    set_cached,
+    set_cached_page,
+    technical_adjustments_key,
+)
+from app.db.session import get_async_sessionmaker
 from app.models import (
     TechnicalAdjustment,
     TechnicalAdjustmentModelField,
     TechnicalAdjustmentField,
     TechnicalAdjustmentModelConfiguration,
 )
-from app.schemas.technical_adjustment import TechnicalAdjustmentListResponse
+from app.schemas.technical_adjustment import (
+    TechnicalAdjustmentListResponse,
+    TechnicalAdjustmentResponse,
+)
+
+router = APIRouter(
+    prefix="/technical-adjustments",
+    tags=["Technical Adjustments"],
+    default_response_class=ORJSONResponse,
+)
+
+
+# Response keys in the same order as the columns projected by get_technical_adjustments.
+# They match TechnicalAdjustmentResponse dumped by alias, as FastAPI emitted it.
+_ROW_KEYS = (
+    "technical_adjustment_id",
+    "model_name",
+    "insurableInterestSetId",
+    "policyTermOptionId",
+    "quoteOptionId",
+    "assetTypes",
+    "appliesTo",
+    "perils",
+    "insuredValueTypes",
+    "adjustmentTypeIdentifierCode",
+    "adjustmentValue",
+    "adjustmentReason",
+    "reasonCategory",
+)
+# Coerced like the ``float`` schema field; orjson cannot encode a Numeric column's Decimal.
+_FLOAT_KEYS = {"adjustmentValue"}
+
+
+def _compile_row_builder() -> Callable[[Row], dict]:
+    """Generate a row -> dict function specialised for ``_ROW_KEYS``.
+
+    Indexing the row tuple directly avoids per-row attribute lookups. The
+    array columns are NOT NULL with a ``'{}'`` default, so no fallback is needed.
+    """
+    items = []
+    for index, key in enumerate(_ROW_KEYS):
+        value = f"float(r[{index}])" if key in _FLOAT_KEYS else f"r[{index}]"
+        items.append(f"{key!r}: {value}")
+    source = "def _build_row(r):\n    return {" + ", ".join(items) + "}\n"
+    namespace: dict = {}
+    exec(source, namespace)
+    return namespace["_build_row"]
+
+
+_build_row = _compile_row_builder()
 
-router = APIRouter(prefix="/technical-adjustments", tags=["Technical Adjustments"])
 
 @router.get(
     "",
-    response_model=TechnicalAdjustmentListResponse,
+    response_model=None,
+    responses={200: {"model": TechnicalAdjustmentListResponse}},
     summary="List technical adjustments by insurable interest and policy term option",
     response_description="List of matching technical adjustments",
 )
-def get_technical_adjustments(
+async def get_technical_adjustments(
     insurable_interest_set_id: UUID = Query(..., description="Insurable interest set UUID"),
     policy_term_option_id: UUID = Query(..., description="Policy term option UUID"),
-    db: Session = Depends(get_db),
 ):
     """
     Get all **Technical Adjustments** for a given
     `insurable_interest_set_id` and `policy_term_option_id`.
 
-    Joins related tables to include model name and adjustment code.
+    Joins related tables to include model name and adjustment code, projecting
+    only the columns the response needs. The body is streamed from a session owned
+    by the response rather than the request-scoped ``get_async_db`` dependency,
+    since FastAPI versions differ on whether that is torn down before the body is sent.
     """
 
-    adjustments = (
-        db.query(TechnicalAdjustment)
-        .options(
-            joinedload(TechnicalAdjustment.model_field)
-            .joinedload(TechnicalAdjustmentModelField.field),
-            joinedload(TechnicalAdjustment.model_field)
-            .joinedload(TechnicalAdjustmentModelField.model_configuration),
+    cache_key = technical_adjustments_key(insurable_interest_set_id, policy_term_option_id)
+    cached = await get_cached(cache_key)
+    if cached is not None:
+        return Response(cached, media_type="application/json")
+
+    stmt = (
+        select(
+            TechnicalAdjustment.id,
+            TechnicalAdjustmentModelConfiguration.model_name,
+            TechnicalAdjustment.insurable_interest_set_id,
+            TechnicalAdjustment.policy_term_option_id,
+            TechnicalAdjustment.quote_option_id,
+            TechnicalAdjustment.asset_types,
+            TechnicalAdjustment.applies_to,
+            TechnicalAdjustment.perils,
+            TechnicalAdjustment.insured_value_types,
+            TechnicalAdjustmentField.adjustment_type_identifier_code,
+            TechnicalAdjustment.adjustment_value,
+            TechnicalAdjustment.adjustment_reason,
+            TechnicalAdjustment.reason_category,
         )
-        .filter(
+        .join(TechnicalAdjustment.model_field)
+        .join(TechnicalAdjustmentModelField.field)
+        .join(TechnicalAdjustmentModelField.model_configuration)
+        .where(
             TechnicalAdjustment.insurable_interest_set_id == insurable_interest_set_id,
             TechnicalAdjustment.policy_term_option_id == policy_term_option_id,
         )
-        .all()
     )
 
-    if not adjustments:
+    session = get_async_sessionmaker()()
+    try:
+        result = await session.stream(stmt.execution_options(yield_per=500))
+        partitions = result.partitions()
+
+        # Peek at the first partition so a miss can still be reported as a 404.
+        first_partition = await anext(partitions, None)
+    except BaseException:
+        await session.close()
+        raise
+
+    if not first_partition:
+        await session.close()
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No technical adjustments found for given parameters",
         )
 
-    results = []
-    for adj in adjustments:
-        results.append({
-            "technicalAdjustmentId": adj.id,
-            "model_name": adj.model_field.model_configuration.model_name,
-            "insurableInterestSetId": adj.insurable_interest_set_id,
-            "policyTermOptionId": adj.policy_term_option_id,
-            "quoteOptionId": adj.quote_option_id,
-            "assetTypes": adj.asset_types or [],
-            "appliesTo": adj.applies_to,
-            "perils": adj.perils or [],
-            "insuredValueTypes": adj.insured_value_types or [],
-            "adjustmentTypeIdentifierCode": adj.model_field.field.adjustment_type_identifier_code,
-            "adjustmentValue": adj.adjustment_value,
-            "adjustmentReason": adj.adjustment_reason,
-            "reasonCategory": adj.reason_category,
-        })
+    async def gen() -> AsyncIterator[bytes]:
+        # Keep what was sent so small bodies can be cached once streaming completes;
+        # past MAX_CACHED_BODY_BYTES stop buffering and serve the stream uncached.
+        try:
+            body: list[bytes] | None = [b'{"technical_adjustments":[']
+            size = len(body[0])
+            yield body[0]
+            first = True
+            partition = first_partition
+            while partition is not None:
+                for row in partition:
+                    chunk = orjson.dumps(_build_row(row))
+                    chunk = chunk if first else b"," + chunk
+                    first = False
+                    if body is not None:
+                        size += len(chunk)
+                        if size <= MAX_CACHED_BODY_BYTES:
+                            body.append(chunk)
+                        else:
+                            body = None
+                    yield chunk
+                partition = await anext(partitions, None)
+            yield b"]}"
+        finally:
+            await session.close()
 
-    return {"technical_adjustments": results}
+        if body is not None:
+            body.append(b"]}")
+            await set_cached(cache_key, b"".join(body))
 
+    return StreamingResponse(gen(), media_type="application/json")
 
 
-from sqlalchemy import select
-from sqlalchemy.orm import joinedload
+def _encode_cursor(record: TechnicalAdjustment) -> str:
+    """Encode the keyset position of ``record`` as an opaque, URL-safe cursor."""
+    payload = {
+        "last_id": str(record.id),
+        "last_created_at": record.created_at.isoformat(),
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor was not produced by ``_encode_cursor``."""
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Decode a cursor produced by ``_encode_cursor`` into ``(created_at, id)``.
+
+    Technical adjustment ids are UUIDs (generated with ``uuid4`` on insert).
+    """
+    try:
+        # binascii.Error, JSONDecodeError and UnicodeDecodeError are all ValueErrors.
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+
+    last_created_at = payload.get("last_created_at") if isinstance(payload, dict) else None
+    last_id = payload.get("last_id") if isinstance(payload, dict) else None
+    if not isinstance(last_created_at, str) or not isinstance(last_id, str):
+        raise InvalidCursorError("Invalid pagination cursor")
+
+    try:
+        return datetime.fromisoformat(last_created_at), UUID(last_id)
+    except ValueError as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
 
-class TechnicalAdjustmentRepository(BaseRepository[TechnicalAdjustment, int, CreateTechnicalAdjustment]):
+
+class TechnicalAdjustmentRepository(
+    BaseRepository[TechnicalAdjustment, UUID, CreateTechnicalAdjustment]
+):
     model = TechnicalAdjustment
 
     def list_with_related_fields(
         self,
-        insurable_interest_set_id: int,
-        policy_term_option_id: int,
-    ) -> list[TechnicalAdjustment]:
-        """List TechnicalAdjustments with joined model field and related data."""
+        insurable_interest_set_id: UUID,
+        policy_term_option_id: UUID,
+    ) -> Iterator[TechnicalAdjustment]:
+        """List TechnicalAdjustments with joined model field and related data.
 
-        stmt = (
-            select(self.model)
-            .options(
-                joinedload(self.model.adjustment_model_field)
+        Rows are streamed from a server-side cursor in batches of 500, so the
+        result must be iterated while the session is still open.
+        """
+
+        # lambda_stmt caches the compiled SQL; the ids are tracked as bound
+        # parameters. Refer to the mapped classes directly, as ``self`` cannot
+        # be part of the lambda's cache key.
+        stmt = lambda_stmt(
+            lambda: select(TechnicalAdjustment).options(
+                joinedload(TechnicalAdjustment.adjustment_model_field)
                 .joinedload(TechnicalAdjustmentModelField.technical_adjustment_field),
-                joinedload(self.model.adjustment_model_field)
+                joinedload(TechnicalAdjustment.adjustment_model_field)
                 .joinedload(TechnicalAdjustmentModelField.technical_adjustment_model_configuration),
             )
-            .where(
-                self.model.insurable_interest_set_id == insurable_interest_set_id,
-                self.model.policy_term_option_id == policy_term_option_id,
-            )
+        )
+        stmt += lambda s: s.where(
+            TechnicalAdjustment.insurable_interest_set_id == insurable_interest_set_id,
+            TechnicalAdjustment.policy_term_option_id == policy_term_option_id,
         )
 
-        return self._session.execute(stmt).scalars().all()
-    
-
-# ----------------------------Paginated 
-class TechnicalAdjustmentRepository(
-    BaseRepository[TechnicalAdjustment, int, CreateTechnicalAdjustment]
-):
-    model = TechnicalAdjustment
+        return self._session.execute(
+            stmt, execution_options={"yield_per": 500}
+        ).scalars()
 
     def list_with_related_fields_paged(
         self,
-        insurable_interest_set_id: int,
-        policy_term_option_id: int,
-        page: int = 1,
+        insurable_interest_set_id: UUID,
+        policy_term_option_id: UUID,
+        cursor: str | None = None,
         page_size: int = 50,
     ) -> PaginatedResponse[TechnicalAdjustment]:
         """
         List TechnicalAdjustments with joined model field and related data, paginated.
+
+        Uses keyset pagination on ``(created_at, id)`` so every page costs the same
+        regardless of depth. Pass the ``next_cursor`` from the previous page's meta
+        to fetch the following page.
         """
 
         # Base filter conditions
@@ -126,18 +273,13 @@ class TechnicalAdjustmentRepository(
             self.model.policy_term_option_id == policy_term_option_id,
         ]
 
-        # Convert page number for offset calculation
-        page = max(page, 1)
-        offset = (page - 1) * page_size
-
-        # ---- Count total items ----
-        total_items = (
-            self._session.execute(
-                select(func.count()).select_from(self.model).where(*filters)
+        # ---- Resume after the last seen row ----
+        if cursor is not None:
+            last_created_at, last_id = _decode_cursor(cursor)
+            filters.append(
+                tuple_(self.model.created_at, self.model.id)
+                < tuple_(last_created_at, last_id)
             )
-            .scalars()
-            .one()
-        )
 
         # ---- Fetch paginated records with joined loads ----
         stmt = (
@@ -149,17 +291,27 @@ class TechnicalAdjustmentRepository(
                 .joinedload(TechnicalAdjustmentModelField.technical_adjustment_model_configuration),
             )
             .where(*filters)
-            .limit(page_size)
-            .offset(offset)
+            .order_by(self.model.created_at.desc(), self.model.id.desc())
+            .limit(page_size + 1)
         )
 
         records = self._session.execute(stmt).scalars().all()
 
-        # ---- Pagination metadata ----
+        # ---- Nothing matched: no cursor to build ----
+        if not records:
+            return PaginatedResponse(
+                meta=PaginatedMeta(has_next=False, next_cursor=None, page_size=page_size),
+                records=[],
+            )
+
+        # ---- One extra row tells us whether another page exists ----
+        has_next = len(records) > page_size
+        records = records[:page_size]
+
+        # ---- Pagination metadata (cursor-based: no page_number/total_pages) ----
         meta = PaginatedMeta(
-            total_items=total_items,
-            total_pages=math.ceil(total_items / page_size) if page_size else 1,
-            page_number=page,
+            has_next=has_next,
+            next_cursor=_encode_cursor(records[-1]) if has_next else None,
             page_size=page_size,
         )
 
@@ -169,59 +321,115 @@ class TechnicalAdjustmentRepository(
         )
 
 
-@router.get("/technical-adjustments", response_model=PaginatedResponse[TechnicalAdjustmentSchema])
-def list_technical_adjustments(
-    insurable_interest_set_id: int,
-    policy_term_option_id: int,
-    page: int = Query(1, ge=1),
-    page_size: int = Query(50, le=200),
-    repo: TechnicalAdjustmentRepository = Depends(get_repository(TechnicalAdjustmentRepository)),
-):
-    return repo.list_with_related_fields_paged(
-        insurable_interest_set_id=insurable_interest_set_id,
-        policy_term_option_id=policy_term_option_id,
-        page=page,
-        page_size=page_size,
-    )    
-
-@router.get(
-    "/technical-adjustments",
-    response_model=PaginatedResponse[TechnicalAdjustmentRead],  # Optional, if you have schema
-)
-def list_technical_adjustments(
-    insurable_interest_set_id: int,
-    policy_term_option_id: int,
-    page: int = Query(1, ge=1),
-    page_size: int = Query(50, le=200),
-    repo: TechnicalAdjustmentRepository = Depends(get_repository(TechnicalAdjustmentRepository)),
-):
-    # ORM-level data
-    paged = repo.list_with_related_fields_paged(
-        insurable_interest_set_id=insurable_interest_set_id,
-        policy_term_option_id=policy_term_option_id,
-        page=page,
-        page_size=page_size,
-    )
-
+def _serialize_page(paged: PaginatedResponse[TechnicalAdjustment]) -> bytes:
+    """Shape a page of ORM records into the cached/returned JSON body."""
     results = []
     for adj in paged.records:
         results.append({
-            "technicalAdjustmentId": adj.id,
+            "technical_adjustment_id": adj.id,
             "model_name": adj.adjustment_model_field.technical_adjustment_model_configuration.model_name,
             "insurableInterestSetId": adj.insurable_interest_set_id,
             "policyTermOptionId": adj.policy_term_option_id,
             "quoteOptionId": adj.quote_option_id,
-            "assetTypes": adj.asset_types or [],
+            "assetTypes": adj.asset_types,
             "appliesTo": adj.applies_to,
-            "perils": adj.perils or [],
-            "insuredValueTypes": adj.insured_value_types or [],
+            "perils": adj.perils,
+            "insuredValueTypes": adj.insured_value_types,
             "adjustmentTypeIdentifierCode": adj.adjustment_model_field.technical_adjustment_field.adjustment_type_identifier_code,
-            "adjustmentValue": adj.adjustment_value,
+            "adjustmentValue": float(adj.adjustment_value),
             "adjustmentReason": adj.adjustment_reason,
             "reasonCategory": adj.reason_category,
         })
 
-    return PaginatedResponse(
-        meta=paged.meta,
-        records=results,
-    )
\ No newline at end of file
+    # Rows come straight from the DB, so skip re-validating them through pydantic.
+    return orjson.dumps({"meta": paged.meta.model_dump(), "records": results})
+
+
+async def _prefetch_page(
+    insurable_interest_set_id: UUID,
+    policy_term_option_id: UUID,
+    cursor: str,
+    page_size: int,
+) -> None:
+    """Load the page after ``cursor`` into the cache so the follow-up request is a hit."""
+    cache_key = technical_adjustments_key(
+        insurable_interest_set_id, policy_term_option_id, cursor, page_size
+    )
+    if await get_cached_page(cache_key) is not None:
+        return
+
+    # Use a dedicated session rather than the request's: when yield-dependency
+    # teardown runs relative to background tasks has changed across FastAPI
+    # versions, and this keeps the prefetch out of the request's transaction.
+    async with get_async_sessionmaker()() as session:
+        paged = await session.run_sync(
+            lambda sync_session: TechnicalAdjustmentRepository(
+                sync_session
+            ).list_with_related_fields_paged(
+                insurable_interest_set_id=insurable_interest_set_id,
+                policy_term_option_id=policy_term_option_id,
+                cursor=cursor,
+                page_size=page_size,
+            )
+        )
+        body = _serialize_page(paged)
+
+    await set_cached_page(
+        cache_key, body, paged.meta.next_cursor, ttl=PREFETCHED_PAGE_TTL_SECONDS
+    )
+
+
+@router.get(
+    "/paged",
+    response_model=None,
+    responses={200: {"model": PaginatedResponse[TechnicalAdjustmentResponse]}},
+)
+async def list_technical_adjustments(
+    insurable_interest_set_id: UUID,
+    policy_term_option_id: UUID,
+    background_tasks: BackgroundTasks,
+    cursor: str | None = Query(None, description="Opaque cursor from the previous page"),
+    page_size: int = Query(50, ge=1, le=200),
+    prefetch_next: bool = Header(
+        False,
+        alias="X-Prefetch-Next",
+        description="Warm the cache with the next page after responding",
+    ),
+    repo: TechnicalAdjustmentRepository = Depends(get_repository(TechnicalAdjustmentRepository)),
+):
+    cache_key = technical_adjustments_key(
+        insurable_interest_set_id, policy_term_option_id, cursor, page_size
+    )
+    cached = await get_cached_page(cache_key)
+    if cached is not None:
+        body, next_cursor = cached
+    else:
+        # ORM-level data
+        try:
+            paged = await run_in_threadpool(
+                repo.list_with_related_fields_paged,
+                insurable_interest_set_id=insurable_interest_set_id,
+                policy_term_option_id=policy_term_option_id,
+                cursor=cursor,
+                page_size=page_size,
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e),
+            ) from e
+        body = _serialize_page(paged)
+        next_cursor = paged.meta.next_cursor
+        await set_cached_page(cache_key, body, next_cursor)
+
+    # Runs after the response is sent, hiding the next page's query behind the client.
+    if prefetch_next and next_cursor is not None:
+        background_tasks.add_task(
+            _prefetch_page,
+            insurable_interest_set_id,
+            policy_term_option_id,
+            next_cursor,
+            page_size,
+        )
+
+    return Response(body, media_type="application/json")
@@ -11,6 +11,7 @@ from sqlalchemy import Table, and_, desc, select
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import DeclarativeBase, contains_eager
 
+from app.cache import mark_technical_adjustments_stale
 from app.database.repository import BaseRepository, BaseRepositoryCore
 from app.vault import models as M
 from app.vault import schema as S
@@ -382,6 +383,7 @@ class TechnicalAdjustmentModelRepository(
             applies_to_db_obj.technical_adjustment = _model
 
         self._session.add(instance=_model, _warn=True)
+        mark_technical_adjustments_stale(self._session, pricing_input_id)
 
         if flush:
             self._session.flush()
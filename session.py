@@ -0,0 +1,30 @@
+from collections.abc import AsyncIterator
+from functools import cache
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.settings import get_app_settings
+
+
+@cache
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """Build the asyncpg engine and session factory on first use.
+
+    The URL comes from ``AppSettings.ASYNC_DATABASE_URL`` (postgresql+asyncpg://...),
+    so importing this module needs no database configuration.
+    """
+    settings = get_app_settings()
+    engine = create_async_engine(
+        settings.ASYNC_DATABASE_URL,
+        pool_size=20,
+        max_overflow=10,
+        pool_pre_ping=True,
+        pool_recycle=3600,
+    )
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """FastAPI dependency yielding an ``AsyncSession`` bound to the asyncpg pool."""
+    async with get_async_sessionmaker()() as session:
+        yield session